@@ -19,6 +19,11 @@ class NoteArray(object):
     timestep = 0                 timestep = 1
      A  A# B  C  C# D  D# E  ... A  A# B  C  C# D  D# E  ...
     [0, 0, 0, 1, 0, 0, 0, 0, ... 1, 0, 0, 1, 0, 0, 0, 0, ...]
+
+    Each note state is a single bit, so the stream is stored packed eight states to a byte in self.packed_array.
+    Reading self.array unpacks the full stream, while get_values_in_range only unpacks the bytes it needs. Both the
+    packed buffer and every unpacked array handed out are 1D, C-contiguous and of dtype bool (uint8 when packed), so
+    consumers can rely on the fast contiguous layout without checking.
     """
 
     def __init__(self, pianoroll=None, flat_array=None, file_path=None, note_array_transformer=None):
@@ -46,11 +51,56 @@ class NoteArray(object):
 
             elif flat_array_is_defined:
                 self.note_array_transformer.validate_flat_array(flat_array)
-                self.array = flat_array.copy()
+                # Packing the bits always writes a new buffer, so the caller's array never needs copying here
+                self.array = flat_array
 
             else:
                 raise Exception("Neither a pianoroll nor a flat_array initializer has been provided.")
 
+    @property
+    def array(self):
+        """
+        The full 1D array of boolean note states, unpacked from self.packed_array.
+
+        Every read unpacks the whole stream into a new copy, so in-place writes such as note_array.array[i] = x are
+        lost. Assign a full array to self.array to change the stored states, and use get_length_in_notes() or
+        get_values_in_range() when only the length or part of the stream is needed.
+        """
+
+        return self.get_unpacked_values(start_index=None, end_index=None)
+
+    @array.setter
+    def array(self, flat_array):
+        """
+        flat_array: 1D array of boolean note states to store in bit-packed form.
+        """
+
+        flat_array = np.ascontiguousarray(flat_array, dtype=np.bool_)
+
+        self.array_length = flat_array.shape[0]
+        self.packed_array = np.packbits(flat_array)
+
+    def get_unpacked_values(self, start_index, end_index):
+        """
+        start_index: Start index of desired note array values (can be None or negative, as in a slice)
+        end_index: End index (non-inclusive) of desired note array values (can be None or negative, as in a slice)
+
+        Returns the boolean note states in the given range, unpacking only the bytes of self.packed_array that
+        overlap the range.
+        """
+
+        start_index, end_index, _ = slice(start_index, end_index).indices(self.array_length)
+
+        if end_index <= start_index:
+            return np.zeros((0,), dtype='bool')
+
+        bit_offset = start_index % 8
+        packed_values = self.packed_array[start_index // 8:(end_index + 7) // 8]
+
+        unpacked_values = np.unpackbits(packed_values, count=(bit_offset + end_index - start_index))
+
+        return unpacked_values[bit_offset:].view(np.bool_)
+
     def get_pianoroll(self):
         """
         Recover the original pianoroll as high of fidelity as possible given the initial down-sampling and cropping.
@@ -64,7 +114,7 @@ class NoteArray(object):
         Returns as an integer the length of the stored 1D array
         """
 
-        return self.array.shape[0]
+        return self.array_length
 
     def get_length_in_timesteps(self):
         """
@@ -99,7 +149,7 @@ class NoteArray(object):
         starting_note_index = starting_time_step * self.note_array_transformer.num_keys
         ending_note_index = starting_note_index + num_time_steps * self.note_array_transformer.num_keys
 
-        array = self.array[starting_note_index:ending_note_index]
+        array = self.get_unpacked_values(start_index=starting_note_index, end_index=ending_note_index)
 
         return self.note_array_transformer.get_note_array(flat_array=array)
 
@@ -118,7 +168,7 @@ class NoteArray(object):
             bounded_start_index = max(start_index, 0)
             bounded_end_index = min(end_index, self.get_length_in_notes())
 
-            values = self.array[bounded_start_index:bounded_end_index]
+            values = self.get_unpacked_values(start_index=bounded_start_index, end_index=bounded_end_index)
 
             if start_index < 0:
                 pad_count_at_start = abs(start_index)
@@ -131,7 +181,7 @@ class NoteArray(object):
                                 pad_width=(pad_count_at_start, pad_count_at_end),
                                 mode='constant').astype('bool')
         else:
-            values = self.array[start_index:end_index]
+            values = self.get_unpacked_values(start_index=start_index, end_index=end_index)
 
         return values
 
@@ -153,22 +203,28 @@ class NoteArray(object):
         if file_path.find('.mna_jl') != -1:
             joblib.dump(self, file_path)
         else:
-            with open(file_path, 'wb') as file:
-                pickle.dump(self, file=file)
+            with open(file_path, 'wb', buffering=(1024 * 1024)) as file:
+                # Protocol 4 is the newest one readable by the python 3.6 and 3.7 environments this project runs in
+                pickle.dump(self, file=file, protocol=4)
 
     def load(self, file_path):
         """
         file_path: Path indicating from where on disc to load the NoteArray instance.
 
-        Loads the NoteArray instance from a file.
+        Loads the NoteArray instance from a file. Arrays in joblib files are memory mapped read-only, so only the parts
+        of the note states that are actually read get paged in from disc.
         """
 
         loaded_instance = None
 
         if file_path.find('.mna_jl') != -1:
-            loaded_instance = joblib.load(file_path)
+            loaded_instance = joblib.load(file_path, mmap_mode='r')
         else:
             with open(file_path, 'rb') as file:
                 loaded_instance = pickle.load(file)
 
         self.__dict__ = loaded_instance.__dict__
+
+        # Instances saved before bit-packing was introduced store the unpacked array directly
+        if 'array' in self.__dict__:
+            self.array = self.__dict__.pop('array')
@@ -44,14 +44,23 @@ class NoteArrayTransformer(object):
         """
         pianoroll: Pianoroll instance to generate NoteArray from
 
-        Generates 1D flat array of boolean key states from the Pianoroll instance pianoroll.
+        Generates 1D flat array of boolean key states from the Pianoroll instance pianoroll. The given pianoroll is
+        never modified, and when resolution is 1.0 it is not copied before cropping.
         """
 
-        downsampled_pianoroll = pianoroll.get_stretched(stretch_fraction=self.resolution)
+        if self.resolution == 1.0:
+            cropped_pianoroll = pianoroll.array[:, self.min_key_index:self.max_key_index]
 
-        cropped_pianoroll = downsampled_pianoroll.array[:, self.min_key_index:self.max_key_index]
+            # Cropping gives a view into the caller's pianoroll, so force the one copy needed here
+            flat_array = np.array(cropped_pianoroll, order='C').ravel()
+        else:
+            downsampled_pianoroll = pianoroll.get_stretched(stretch_fraction=self.resolution)
 
-        flat_array = cropped_pianoroll.flatten()
+            cropped_pianoroll = downsampled_pianoroll.array[:, self.min_key_index:self.max_key_index]
+
+            # The downsampled pianoroll is already a private copy, so a view is safe here. ravel only copies if the
+            # crop is non-contiguous (num_keys < 128), whereas flatten would always copy.
+            flat_array = np.ascontiguousarray(cropped_pianoroll).ravel()
 
         return flat_array
 
@@ -73,7 +82,12 @@ class NoteArrayTransformer(object):
         unflattened_pianoroll_array[:,
         self.min_key_index:self.min_key_index + self.num_keys] = flat_array
 
-        return Pianoroll(unflattened_pianoroll_array).get_stretched(stretch_fraction=(1.0 / self.resolution))
+        pianoroll = Pianoroll(unflattened_pianoroll_array)
+
+        # The new pianoroll already owns its array, so stretch in place rather than through another copy
+        pianoroll.stretch(stretch_fraction=(1.0 / self.resolution))
+
+        return pianoroll
 
     def validate_flat_array(self, flat_array):
         """
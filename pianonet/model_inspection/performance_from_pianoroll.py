@@ -7,12 +7,17 @@ from pianonet.model_inspection.performance_tools import get_performance
 
 def get_performance_from_pianoroll(pianoroll_seed,
                               num_time_steps,
-                              model_path):
+                              model_path=None,
+                              model=None):
     """
     Creates a performance starting from a pianoroll seed.
+
+    model_path: Path to the saved Keras model, only loaded if model is not given
+    model: Optional already loaded Keras model, which avoids reloading the model from disc on every call
     """
 
-    model = load_model(model_path)
+    if model == None:
+        model = load_model(model_path)
 
     aversion_params_dict = {
         'probability_thresholds': [1.0, 1.0, 0.4, 0.05, 0.05, 0.05, 0.03, 0.03],
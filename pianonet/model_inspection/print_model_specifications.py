@@ -1,20 +1,24 @@
 from pianonet.model_building.get_model_input_shape import get_model_input_shape
 
 
-def print_model_specifications(model, num_keys, print_function=None):
+def print_model_specifications(model, num_keys, print_function=None, num_notes_in_model_input=None):
     """
     Prints the relevant specs of the model using the print_function
 
     model: Keras model to print the specifications of
     num_keys: Integer specifying how many keys are in the input piano time step states
     print_function: Method for logging or printing the specs. If None, print() is used.
+    num_notes_in_model_input: Optional input size of the model if already known, saving a walk over the model's layers
     """
 
     if print_function == None:
         print_function = print
 
     print_function("")
-    num_notes_in_model_input = get_model_input_shape(model)
+
+    if num_notes_in_model_input == None:
+        num_notes_in_model_input = get_model_input_shape(model)
+
     time_steps_receptive_field = num_notes_in_model_input / num_keys
 
     print_function("Number of notes in model input: " + str(num_notes_in_model_input))
@@ -43,6 +43,18 @@ def main():
     with open(parameters_file_path, 'rb') as params_file:
         model_params = pickle.load(params_file)
 
+    create_model(model_params=model_params, model_output_path=model_output_path)
+
+
+def create_model(model_params, model_output_path):
+    """
+    Builds the model described by the model_params dictionary and saves it to model_output_path. This can be called
+    directly by importing this file, which avoids starting a new python process to create a model.
+
+    model_params: Dictionary of model parameters as described at the top of this file
+    model_output_path: Path to which the created model is saved
+    """
+
     if 'filters' in model_params:
         filters = model_params['filters']
 
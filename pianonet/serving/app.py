@@ -1,7 +1,9 @@
 import os
-import random
+import threading
+from uuid import uuid4
 
 from flask import Flask, request, send_from_directory
+from tensorflow.keras.models import load_model
 from werkzeug.utils import secure_filename
 
 from pianonet.core.pianoroll import Pianoroll
@@ -9,11 +11,28 @@ from pianonet.model_inspection.performance_from_pianoroll import get_performance
 
 app = Flask(__name__)
 
-base_path = "/app/"
-
-# base_path = "/Users/angsten/PycharmProjects/pianonet"
+# Set PIANONET_BASE_PATH to serve from a checkout other than the docker image's /app directory. The path is made
+# absolute because send_from_directory resolves relative directories against the app's root path, not the cwd.
+base_path = os.path.abspath(os.environ.get('PIANONET_BASE_PATH', '/app/'))
 
 performances_path = os.path.join(base_path, 'data', 'performances')
+seeds_path = os.path.join(base_path, 'data', 'seeds')
+models_path = os.path.join(base_path, 'models')
+
+model_names_by_complexity = {
+    'low': "micro_1",
+    'medium': "r9p0_3500kparams_approx_9_blocks_model",
+    'high': "r9p0_3500kparams_approx_9_blocks_model",
+    'highest': "r9p0_3500kparams_approx_9_blocks_model",
+}
+
+model_paths_by_complexity = {
+    model_complexity: os.path.join(models_path, model_name)
+    for model_complexity, model_name in model_names_by_complexity.items()
+}
+
+loaded_models = {}
+loaded_models_lock = threading.Lock()
 
 
 def get_random_midi_file_name():
@@ -21,7 +40,7 @@ def get_random_midi_file_name():
     Get a random midi file name that will not ever collide.
     """
 
-    return str(random.randint(0, 10000000000000000000)) + ".midi"
+    return uuid4().hex + ".midi"
 
 
 def get_performance_path(midi_file_name):
@@ -32,6 +51,36 @@ def get_performance_path(midi_file_name):
     return os.path.join(performances_path, midi_file_name)
 
 
+def get_model(model_path):
+    """
+    Returns the Keras model saved at model_path. Each model is loaded from disc only once per process, and later
+    calls reuse the loaded instance.
+    """
+
+    model = loaded_models.get(model_path)
+
+    if model == None:
+        # Only the first load of a model takes the lock, so requests for already loaded models are never blocked
+        with loaded_models_lock:
+            if model_path not in loaded_models:
+                loaded_models[model_path] = load_model(model_path)
+
+            model = loaded_models[model_path]
+
+    return model
+
+
+@app.before_first_request
+def create_data_directories():
+    """
+    Creates the seed and performance directories once, at startup rather than at import, so importing this module
+    never writes to disc.
+    """
+
+    os.makedirs(performances_path, exist_ok=True)
+    os.makedirs(seeds_path, exist_ok=True)
+
+
 @app.route('/')
 def alive():
     return 'OK'
@@ -46,7 +95,7 @@ def get_performance():
 
     performance_midi_file_name = request.args.get('midi_file_name')
     performance_midi_file_name = secure_filename(performance_midi_file_name)
-    print(performance_midi_file_name)
+    app.logger.info("Performance requested: %s", performance_midi_file_name)
 
     if performance_midi_file_name == None:
         return {"http_code": 400, "code": "BadRequest", "message": "midi_file_name not found in request."}
@@ -60,8 +109,7 @@ def get_performance():
             "message": "midi_file " + performance_midi_file_name + " not found."
         }
 
-    with open(midi_file_path, 'rb') as midi_file:
-        return send_from_directory(performances_path, performance_midi_file_name)
+    return send_from_directory(performances_path, performance_midi_file_name)
 
 
 @app.route('/create-performance', methods=['POST'])
@@ -78,13 +126,9 @@ def performance():
     if seed_midi_file_data == None:
         return {"http_code": 400, "code": "BadRequest", "message": "seed_midi_file_data not found in request."}
     else:
-        seed_midi_file_int_array = [int(x) for x in seed_midi_file_data.split(',')]
-
-        frame = bytearray()
-        for i in seed_midi_file_int_array:
-            frame.append(i)
+        frame = bytes(int(x) for x in seed_midi_file_data.split(','))
 
-        saved_seed_midi_file_path = os.path.join(base_path, 'data', 'seeds', get_random_midi_file_name())
+        saved_seed_midi_file_path = os.path.join(seeds_path, get_random_midi_file_name())
 
         with open(saved_seed_midi_file_path, 'wb') as midi_file:
             midi_file.write(frame)
@@ -98,12 +142,7 @@ def performance():
 
     model_complexity = request.form.get('model_complexity', 'low')
 
-    if model_complexity == 'low':
-        model_name = "micro_1"
-    else:
-        model_name = "r9p0_3500kparams_approx_9_blocks_model"
-
-    model_path = os.path.join(base_path, 'models', model_name)
+    model_path = model_paths_by_complexity.get(model_complexity, model_paths_by_complexity['highest'])
 
     input_pianoroll = Pianoroll(saved_seed_midi_file_path, use_custom_multitrack=True)
 
@@ -112,7 +151,7 @@ def performance():
     final_pianoroll = get_performance_from_pianoroll(
         pianoroll_seed=input_pianoroll,
         num_time_steps=int(48 * seconds_to_generate),
-        model_path=model_path,
+        model=get_model(model_path),
     )
 
     midi_file_name = get_random_midi_file_name()
@@ -28,14 +28,16 @@ class Logger(object):
             tf_logger.setLevel(logging.WARNING)
             tf_logger.addHandler(f_handler)
 
-    def log(self, message=''):
+    def log(self, message='', *args):
         """
         Write message to the log file. Dictionaries will be pretty printed.
 
         message: Can be a string or dictionary that will get logged by self.logger.
+        args: Optional values merged into a string message using %-style formatting. Formatting is left to self.logger,
+              so it is skipped entirely if the message would not be emitted.
         """
 
         if isinstance(message, str):
-            self.logger.info(message)
+            self.logger.info(message, *args)
         elif isinstance(message, dict):
             self.logger.info(self.pp.pformat(message))
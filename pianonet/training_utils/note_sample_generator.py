@@ -72,13 +72,19 @@ class NoteSampleGenerator(object):
 
         return self.get_total_samples_count() // self.batch_size
 
-    def get_fraction_data_seen(self):
+    def get_fraction_data_seen(self, samples_generated_count=None):
         """
         Returns the fraction of data already generated. For example, if all samples have been generated once as well as
         30% of the second pass through, this method will return 1.3.
+
+        samples_generated_count: If given, return the fraction for this many total generated samples instead of the
+                                 generator's current position (see get_state_dictionary)
         """
 
-        return self.full_runs_through_data_count + self.prediction_start_indices_index / self.get_total_samples_count()
+        if samples_generated_count == None:
+            samples_generated_count = self.get_samples_generated_count()
+
+        return samples_generated_count / self.get_total_samples_count()
 
     def set_prediction_start_indices_index(self, prediction_start_indices_index):
         """
@@ -184,17 +190,35 @@ class NoteSampleGenerator(object):
 
         return summary_string
 
-    def get_state_dictionary(self):
+    def get_samples_generated_count(self):
+        """
+        Returns the total number of samples generated so far, including those from previous passes through the data.
+        """
+
+        return self.full_runs_through_data_count * self.get_total_samples_count() + self.prediction_start_indices_index
+
+    def get_state_dictionary(self, samples_generated_count=None):
         """
         Returns dictionary specifying state of this generator. The state is basically where in the dataset this
         generator currently points, making sure progress is tracked. The state is NOT the data or the prediction
         indices.
+
+        samples_generated_count: If given, return the state the generator had after generating this many samples
+                                 in total instead of its current state. This is useful when batches are read ahead
+                                 of the samples actually consumed.
         """
 
         state = {}
 
-        state['prediction_start_indices_index'] = self.prediction_start_indices_index
-        state['full_runs_through_data_count'] = self.full_runs_through_data_count
+        if samples_generated_count == None:
+            state['prediction_start_indices_index'] = self.prediction_start_indices_index
+            state['full_runs_through_data_count'] = self.full_runs_through_data_count
+        else:
+            full_runs_through_data_count, prediction_start_indices_index = divmod(samples_generated_count,
+                                                                                  self.get_total_samples_count())
+
+            state['prediction_start_indices_index'] = int(prediction_start_indices_index)
+            state['full_runs_through_data_count'] = int(full_runs_through_data_count)
 
         return state
 
@@ -208,12 +232,17 @@ class NoteSampleGenerator(object):
         self.prediction_start_indices_index = state_dictionary['prediction_start_indices_index']
         self.full_runs_through_data_count = state_dictionary['full_runs_through_data_count']
 
-    def save_state(self, file_path):
+    def save_state(self, file_path, samples_generated_count=None):
         """
         Save generators state to file.
+
+        samples_generated_count: If given, save the state as of this many total generated samples (see
+                                 get_state_dictionary)
         """
 
-        save_dictionary_to_json_file(dictionary=self.get_state_dictionary(), json_file_path=file_path)
+        state_dictionary = self.get_state_dictionary(samples_generated_count=samples_generated_count)
+
+        save_dictionary_to_json_file(dictionary=state_dictionary, json_file_path=file_path)
 
     def load_state(self, file_path):
         """
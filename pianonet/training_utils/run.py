@@ -1,6 +1,5 @@
+import importlib.util
 import os
-import pickle
-import subprocess
 import time
 
 import numpy as np
@@ -45,7 +44,7 @@ class Run(Logger):
         for i in range(0, 3): self.log()
         self.log("*-" * 60)
         self.log("*-" * 60)
-        self.log("*-*-*-*-* BEGINNING RUN AT " + self.path)
+        self.log("*-*-*-*-* BEGINNING RUN AT %s", self.path)
         self.log("*-" * 60)
         self.log("*-" * 60)
         for i in range(0, 2): self.log()
@@ -67,7 +66,7 @@ class Run(Logger):
 
             previous_model_path = self.get_model_path(run_index=self.get_run_index() - 1)
 
-            self.log("Using previous model at " + previous_model_path)
+            self.log("Using previous model at %s", previous_model_path)
             self.run_description['model_description']['model_path'] = previous_model_path
 
         else:
@@ -137,11 +136,11 @@ class Run(Logger):
 
         if self.mode == 'train':
             self.log()
-            self.log("Loading training master note array from " + data_description['training_master_note_array_path'])
+            self.log("Loading training master note array from %s", data_description['training_master_note_array_path'])
             self.training_master_note_array = MasterNoteArray(
                 file_path=data_description['training_master_note_array_path'])
 
-        self.log("Loading validation master note array from " + data_description['validation_master_note_array_path'])
+        self.log("Loading validation master note array from %s", data_description['validation_master_note_array_path'])
         self.validation_master_note_array = MasterNoteArray(
             file_path=data_description['validation_master_note_array_path'])
 
@@ -158,37 +157,46 @@ class Run(Logger):
 
         self.log()
         if model_description['model_path'] != "":
-            self.log("Loading model at " + model_description['model_path'])
+            self.log("Loading model at %s", model_description['model_path'])
 
-            self.model = load_model(model_description['model_path'])
+            self.model = load_model(model_description['model_path'], compile=not self.get_need_to_compile_model())
 
         elif 'model_initializer' in model_description:
             model_initializer = model_description['model_initializer']
-            self.log("Initializing model using file at " + model_initializer['path'])
-            self.log("Params used for model initialization are " + str(model_initializer['params']))
+            self.log("Initializing model using file at %s", model_initializer['path'])
+            self.log("Params used for model initialization are %s", model_initializer['params'])
 
             model_output_path = os.path.join(self.path, "models", "initial_model")
-            model_parameters_file_path = self.get_full_run_path('model_parameters')
 
-            with open(model_parameters_file_path, 'wb') as file:
-                pickle.dump(model_initializer['params'], file)
+            # Run the model creator in this process rather than paying for a new interpreter and tensorflow import
+            model_creator_spec = importlib.util.spec_from_file_location('model_creator', model_initializer['path'])
+            model_creator = importlib.util.module_from_spec(model_creator_spec)
+            model_creator_spec.loader.exec_module(model_creator)
 
-            model_creation_command = "python " + model_initializer[
-                'path'] + " " + model_parameters_file_path + " " + model_output_path
-            self.log("Calling model creator with command:")
-            self.log(model_creation_command)
+            self.log("Calling model creator in file %s", model_initializer['path'])
+            model_creator.create_model(model_params=model_initializer['params'], model_output_path=model_output_path)
 
-            try:
-                subprocess.run(model_creation_command, shell=True, check=True)
-            finally:
-                os.remove(model_parameters_file_path)
-
-            self.model = load_model(model_output_path)
+            self.model = load_model(model_output_path, compile=not self.get_need_to_compile_model())
 
         else:
             raise Exception("No method of creating or loading the model has been specified in the run description.")
 
-        print_model_specifications(model=self.model, num_keys=self.num_keys, print_function=self.log)
+        self.num_notes_in_model_input = get_model_input_shape(self.model)
+
+        print_model_specifications(model=self.model,
+                                   num_keys=self.num_keys,
+                                   print_function=self.log,
+                                   num_notes_in_model_input=self.num_notes_in_model_input)
+
+    def get_need_to_compile_model(self):
+        """
+        Returns True if the model is compiled with a fresh optimizer before training. This happens on the first run or
+        when layers are frozen. Otherwise the optimizer state saved with the previous run's model is reused.
+        """
+
+        num_non_trainable_layers = self.run_description['training_description'].get('num_non_trainable_layers', 0)
+
+        return (self.get_run_index() == 0) or (num_non_trainable_layers != 0)
 
     def fetch_data_generators(self):
         """
@@ -196,12 +204,13 @@ class Run(Logger):
         saved training data generators. Also load the validation data generator (never loaded from file).
         """
 
-        num_notes_in_model_input = get_model_input_shape(self.model)
+        num_notes_in_model_input = self.num_notes_in_model_input
+        num_keys = self.num_keys
 
         if self.mode == 'train':
             training_description = self.run_description['training_description']
             training_batch_size = training_description['batch_size']
-            num_predicted_notes_in_training_sample = self.num_keys * training_description[
+            num_predicted_notes_in_training_sample = num_keys * training_description[
                 'num_predicted_time_steps_in_sample']
 
             self.training_note_sample_generator = NoteSampleGenerator(
@@ -216,14 +225,14 @@ class Run(Logger):
                 self.log("Creating a fresh training generator.")
             else:
                 previous_generator_state_path = self.get_generator_state_path(run_index=self.get_run_index() - 1)
-                self.log("Loading previous training generator state from path " + previous_generator_state_path)
+                self.log("Loading previous training generator state from path %s", previous_generator_state_path)
                 self.training_note_sample_generator.load_state(file_path=previous_generator_state_path)
 
-            self.log('\n' * 2 + self.training_note_sample_generator.get_summary_string() + '\n')
+            self.log('\n\n%s\n', self.training_note_sample_generator.get_summary_string())
 
         validation_description = self.run_description['validation_description']
         validation_batch_size = validation_description['batch_size']
-        num_predicted_notes_in_validation_sample = self.num_keys * validation_description[
+        num_predicted_notes_in_validation_sample = num_keys * validation_description[
             'num_predicted_time_steps_in_sample']
 
         self.validation_note_sample_generator = NoteSampleGenerator(
@@ -235,7 +244,7 @@ class Run(Logger):
         )
 
         if self.mode == 'evaluate':
-            self.log('\n' * 2 + self.validation_note_sample_generator.get_summary_string() + '\n')
+            self.log('\n\n%s\n', self.validation_note_sample_generator.get_summary_string())
 
     def save_model(self):
         """
@@ -246,11 +255,43 @@ class Run(Logger):
 
     def save_generator_state(self):
         """
-        Save the training data generator's state to file prepended with the current run index.
+        Save the training data generator's state to file prepended with the current run index. Because the training
+        dataset prefetches batches, the generator runs ahead of training, so the state is saved as of the last batch
+        the model actually trained on.
         """
 
         generator_checkpoint_path = self.get_generator_state_path(run_index=self.get_run_index())
-        self.training_note_sample_generator.save_state(generator_checkpoint_path)
+        self.training_note_sample_generator.save_state(
+            file_path=generator_checkpoint_path,
+            samples_generated_count=self.get_trained_samples_count()
+        )
+
+    def get_trained_samples_count(self):
+        """
+        Returns the total number of training samples the model has trained on, counting previous runs. Unlike the
+        training generator's own position, this excludes batches that have been prefetched but not yet trained on.
+        """
+
+        trained_batches_count = self.save_state_callback.train_batches_seen
+        batch_size = self.training_note_sample_generator.batch_size
+
+        return self.initial_training_samples_count + trained_batches_count * batch_size
+
+    def get_dataset_from_generator(self, note_sample_generator):
+        """
+        Wraps a NoteSampleGenerator in a tf.data.Dataset that prefetches batches, so batch assembly in python overlaps
+        with the model's training or evaluation steps.
+
+        note_sample_generator: NoteSampleGenerator instance yielding batches of (inputs, targets)
+        """
+
+        dataset = tf.data.Dataset.from_generator(
+            lambda: note_sample_generator,
+            output_types=(tf.bool, tf.bool),
+            output_shapes=(tf.TensorShape([None, None, 1]), tf.TensorShape([None, None, 1]))
+        )
+
+        return dataset.prefetch(tf.data.experimental.AUTOTUNE)
 
     def archive_model_method_creator(self):
         """
@@ -268,11 +309,18 @@ class Run(Logger):
         as an exact checkpoint from which a future run can be restarted without any change in the training outcome.
         """
 
+        run_description_saved = False
+
         def checkpoint(batch=None, logs=None):
-            save_dictionary_to_json_file(
-                dictionary=self.run_description,
-                json_file_path=self.get_run_description_path(run_index=self.get_run_index())
-            )
+            nonlocal run_description_saved
+
+            # The run description is fixed for the whole run, so only the first checkpoint needs to write it
+            if not run_description_saved:
+                save_dictionary_to_json_file(
+                    dictionary=self.run_description,
+                    json_file_path=self.get_run_description_path(run_index=self.get_run_index())
+                )
+                run_description_saved = True
 
             self.save_state()
             self.save_model()
@@ -293,18 +341,28 @@ class Run(Logger):
         elif mode == 'evaluate':
             generator = self.validation_note_sample_generator
 
+        # The datasets prefetch batches, so the generator's own position runs ahead of the batches actually consumed.
+        # Training progress comes from get_trained_samples_count, and evaluated samples are counted here.
+        evaluated_samples_count = generator.get_samples_generated_count()
+
         def logging_method(batch=None, logs=None):
-            if logs != {}:
-                batch_string = str(batch) + '/' + str(steps_per_epoch)
-                percent_data_string = str(
-                    round(generator.get_fraction_data_seen() * 100, 3)) + '%'
-                loss_string = str(round(logs.get('loss'), 7))
+            nonlocal evaluated_samples_count
 
-                mode_string = '        Evaluating on test set: ' if mode == 'evaluate' else ''
+            if mode == 'train':
+                samples_seen_count = self.get_trained_samples_count()
+            else:
+                evaluated_samples_count += generator.batch_size
+                samples_seen_count = evaluated_samples_count
 
-                log_string = mode_string + batch_string + ' ' + percent_data_string + ' ' + loss_string
+            if logs != {}:
+                mode_string = '        Evaluating on test set: ' if mode == 'evaluate' else ''
 
-                self.log(log_string)
+                self.log("%s%s/%s %s%% %s",
+                         mode_string,
+                         batch,
+                         steps_per_epoch,
+                         round(generator.get_fraction_data_seen(samples_generated_count=samples_seen_count) * 100, 3),
+                         round(logs.get('loss'), 7))
 
         return logging_method
 
@@ -314,8 +372,9 @@ class Run(Logger):
         """
 
         def epoch_logging_method(epoch=None, logs=None):
-            percent_data_string = str(
-                round(self.training_note_sample_generator.get_fraction_data_seen() * 100, 3)) + '%'
+            fraction_data_seen = self.training_note_sample_generator.get_fraction_data_seen(
+                samples_generated_count=self.get_trained_samples_count())
+            percent_data_string = str(round(fraction_data_seen * 100, 3)) + '%'
             cpu_time_taken_string = str(round(time.clock() - logs['start_cpu_time'], 1))
             wall_time_taken_string = str(round(time.time() - logs['start_wall_time'], 1))
             loss_string = str(round(logs.get('loss'), 7))
@@ -351,9 +410,7 @@ class Run(Logger):
 
         num_non_trainable_layers = training_description.get('num_non_trainable_layers', 0)
 
-        need_to_compile_model = (self.get_run_index() == 0) or (num_non_trainable_layers != 0)
-
-        if need_to_compile_model:
+        if self.get_need_to_compile_model():
             if optimizer_description['type'] == 'Adam':
                 optimizer = Adam(**optimizer_description['kwargs'])
             elif optimizer_description['type'] == 'Nadam':
@@ -362,7 +419,7 @@ class Run(Logger):
                 raise Exception("Optimizer type " + optimizer_description['type'] + " not yet supported.")
 
             if num_non_trainable_layers != 0:
-                self.log("Freezing the first " + str(num_non_trainable_layers) + " layers.")
+                self.log("Freezing the first %s layers.", num_non_trainable_layers)
                 for layer in self.model.layers[0:num_non_trainable_layers]:
                     layer.trainable = False
 
@@ -373,7 +430,7 @@ class Run(Logger):
         fraction_validation_data_each_epoch = validation_description['fraction_data_each_epoch']
 
         epochs = training_description['epochs']
-        save_state_callback = ExecuteEveryNBatchesAndEpochCallback(
+        self.save_state_callback = ExecuteEveryNBatchesAndEpochCallback(
             train_run_frequency_in_batches=training_description['checkpoint_frequency_in_steps'],
             train_method_to_run=self.checkpoint_method_creator(),
             method_to_run_on_epoch_end=self.archive_model_method_creator(),
@@ -388,8 +445,8 @@ class Run(Logger):
 
             self.log()
             self.log("Beginning training.")
-            self.log("    Training steps per epoch: " + str(training_steps_per_epoch))
-            self.log("    Validation steps per epoch: " + str(validation_steps_per_epoch))
+            self.log("    Training steps per epoch: %s", training_steps_per_epoch)
+            self.log("    Validation steps per epoch: %s", validation_steps_per_epoch)
             self.log()
 
             logging_callback = ExecuteEveryNBatchesAndEpochCallback(
@@ -415,14 +472,16 @@ class Run(Logger):
             self.log('    Non-trainable parameters: {:,}'.format(non_trainable_parameters_count))
             self.log()
 
+            self.initial_training_samples_count = self.training_note_sample_generator.get_samples_generated_count()
+
             self.model.fit(
-                x=self.training_note_sample_generator,
+                x=self.get_dataset_from_generator(self.training_note_sample_generator),
                 epochs=epochs,
                 verbose=2,
                 steps_per_epoch=training_steps_per_epoch,
-                validation_data=self.validation_note_sample_generator,
+                validation_data=self.get_dataset_from_generator(self.validation_note_sample_generator),
                 validation_steps=validation_steps_per_epoch,
-                callbacks=[logging_callback, save_state_callback]
+                callbacks=[self.save_state_callback, logging_callback]
             )
         elif self.mode == 'evaluate':
             training_steps_per_epoch = 1
@@ -441,7 +500,7 @@ class Run(Logger):
             )
 
             self.model.evaluate(
-                x=self.validation_note_sample_generator,
+                x=self.get_dataset_from_generator(self.validation_note_sample_generator),
                 verbose=2,
                 steps=validation_steps_per_epoch,
                 callbacks=[logging_callback]